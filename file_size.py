@@ -21,22 +21,47 @@ Notes on depth:
 
 from __future__ import annotations
 
+import ctypes
+import functools
+import heapq
 import os
+import queue
+import struct
 import sys
+import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle
 from openpyxl.utils import get_column_letter
 
+# Optional Excel writers, tried in this order; openpyxl is the fallback.
+try:
+    # Streams rows to disk (constant_memory), so memory stays flat
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
-@dataclass
+try:
+    # Much faster bulk writer for plain tables
+    import pyexcelerate
+    from pyexcelerate.DataTypes import DataTypes as XlsxDataTypes
+except ImportError:
+    pyexcelerate = None
+
+
+# slots: no per-instance __dict__, which matters with 100k+ results
+@dataclass(slots=True)
 class ScanResult:
     index: int
     rel_dir: str
@@ -44,82 +69,474 @@ class ScanResult:
     size_bytes: int
     size_mb: float
     full_path: str
-    mtime: str
+    mtime: float  # st_mtime; formatted on demand via mtime_str
+
+    @property
+    def mtime_str(self) -> str:
+        return _format_mtime(int(self.mtime))
+
+
+@functools.lru_cache(maxsize=65536)
+def _format_mtime(seconds: int) -> str:
+    # Cached per second: batch-copied files often share a timestamp
+    try:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+    except (OverflowError, OSError, ValueError):
+        return ""
 
 
 def _human_mb(size_bytes: int) -> float:
     return round(size_bytes / (1024 * 1024), 3)
 
 
-def _safe_relpath(child: Path, root: Path) -> str:
+def _is_pdf(name: str) -> bool:
+    # Lowercase only the 4-char suffix, not the whole name of every entry
+    return name[-4:].lower() == ".pdf"
+
+
+def _safe_relpath(child: str, root: str) -> str:
+    """Relative path of child under root ("" for root itself), else child."""
+    if child == root:
+        return ""
+    prefix = os.path.join(root, "")
+    if child.startswith(prefix):
+        return child[len(prefix):]
+    try:
+        return os.path.relpath(child, root)
+    except ValueError:
+        # e.g. different drives on Windows
+        return child
+
+
+# Threads used to list folders. On a warm local disk listing is CPU-bound and
+# the serial walk is fastest (/usr, 7.9k folders: 148 ms serial, 190-330 ms
+# with 2-32 threads). A pool only pays off when each listing waits on I/O, as
+# on network shares: with 2 ms per folder, 523 folders took 1178 ms serially
+# and 93 ms with 32 threads. Pass workers= to iter_pdf_files for that case.
+SCAN_WORKERS = 1
+
+# Folders that are almost never worth descending: VCS/tool caches and OS
+# system folders. Used by the GUI's "skip system folders" option.
+DEFAULT_SKIP_DIRS = frozenset(
+    {
+        ".git",
+        "node_modules",
+        ".venv",
+        "__pycache__",
+        "$RECYCLE.BIN",
+        "System Volume Information",
+        ".Trashes",
+        ".Spotlight-V100",
+    }
+)
+
+# Windows and macOS filesystems ignore case when matching names; current
+# Windows, for one, lists the recycle bin as "$Recycle.Bin".
+_FS_IGNORES_CASE = sys.platform in ("win32", "darwin")
+
+# (path, size in bytes, mtime)
+PdfHit = Tuple[str, int, float]
+
+
+def _scan_dir(folder: str, want_dirs: bool) -> Tuple[List[PdfHit], List[str]]:
+    """List one folder: PDFs found there and (if wanted) its subfolders."""
+    pdfs: List[PdfHit] = []
+    subdirs: List[str] = []
+    # This loop runs once per directory entry, so keep lookups out of it
+    add_pdf = pdfs.append
+    add_dir = subdirs.append
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                name = entry.name
+
+                try:
+                    # Name test first (inlined _is_pdf): most entries are not
+                    # PDFs and need no type check. A PDF costs at most one
+                    # metadata call: is_file() is free when d_type is known,
+                    # and otherwise its lstat is cached for entry.stat().
+                    if name[-4:].lower() == ".pdf" and entry.is_file(follow_symlinks=False):
+                        # Cached on the entry (free on Windows)
+                        st = entry.stat(follow_symlinks=False)
+                        add_pdf((entry.path, st.st_size, st.st_mtime))
+                        continue
+                    if want_dirs and entry.is_dir(follow_symlinks=False):
+                        add_dir(entry.path)
+                except OSError:
+                    # Skip unreadable (or vanished) entries
+                    continue
+    except OSError:
+        pass
+    return pdfs, subdirs
+
+
+# --- Windows: FindFirstFileExW ----------------------------------------------
+# The find data already carries size, mtime and attributes for every entry, so
+# a folder is listed without opening any file.
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    _FIND_EX_INFO_BASIC = 1
+    _FIND_EX_SEARCH_NAME_MATCH = 0
+    _FIND_FIRST_EX_LARGE_FETCH = 2
+    _FILE_ATTRIBUTE_DIRECTORY = 0x10
+    _FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+    _IO_REPARSE_TAG_SYMLINK = 0xA000000C
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+    # 100-ns intervals between 1601-01-01 and 1970-01-01
+    _FILETIME_EPOCH = 116444736000000000
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _FindFirstFileExW = _kernel32.FindFirstFileExW
+    _FindFirstFileExW.argtypes = [
+        wintypes.LPCWSTR,
+        ctypes.c_int,
+        ctypes.POINTER(wintypes.WIN32_FIND_DATAW),
+        ctypes.c_int,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+    ]
+    _FindFirstFileExW.restype = wintypes.HANDLE
+    _FindNextFileW = _kernel32.FindNextFileW
+    _FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.WIN32_FIND_DATAW)]
+    _FindNextFileW.restype = wintypes.BOOL
+    _FindClose = _kernel32.FindClose
+    _FindClose.argtypes = [wintypes.HANDLE]
+    _FindClose.restype = wintypes.BOOL
+
+
+def _scan_dir_win32(folder: str, want_dirs: bool) -> Tuple[List[PdfHit], List[str]]:
+    """Windows counterpart of _scan_dir built on FindFirstFileExW/FindNextFileW."""
+    pdfs: List[PdfHit] = []
+    subdirs: List[str] = []
+    data = wintypes.WIN32_FIND_DATAW()
+    handle = _FindFirstFileExW(
+        os.path.join(folder, "*"),
+        _FIND_EX_INFO_BASIC,
+        ctypes.byref(data),
+        _FIND_EX_SEARCH_NAME_MATCH,
+        None,
+        _FIND_FIRST_EX_LARGE_FETCH,
+    )
+    if handle == _INVALID_HANDLE_VALUE:
+        # Empty, unreadable or vanished folder
+        return pdfs, subdirs
+
+    try:
+        while True:
+            name = data.cFileName
+            attrs = data.dwFileAttributes
+            # Same rule as DirEntry.is_symlink(): only true symlinks are links
+            is_link = (
+                attrs & _FILE_ATTRIBUTE_REPARSE_POINT
+                and data.dwReserved0 == _IO_REPARSE_TAG_SYMLINK
+            )
+            if name in (".", "..") or is_link:
+                pass
+            elif attrs & _FILE_ATTRIBUTE_DIRECTORY:
+                if want_dirs:
+                    subdirs.append(os.path.join(folder, name))
+            elif _is_pdf(name):
+                size = (data.nFileSizeHigh << 32) | data.nFileSizeLow
+                ft = data.ftLastWriteTime
+                mtime = (((ft.dwHighDateTime << 32) | ft.dwLowDateTime) - _FILETIME_EPOCH) / 1e7
+                pdfs.append((os.path.join(folder, name), size, mtime))
+
+            if not _FindNextFileW(handle, ctypes.byref(data)):
+                break
+    finally:
+        _FindClose(handle)
+    return pdfs, subdirs
+
+
+# --- macOS: getattrlistbulk(2) ----------------------------------------------
+# Returns name, type, mtime and size for many entries per syscall instead of
+# one readdir plus one stat per file.
+
+_ATTR_BIT_MAP_COUNT = 5
+_ATTR_CMN_NAME = 0x00000001
+_ATTR_CMN_OBJTYPE = 0x00000008
+_ATTR_CMN_MODTIME = 0x00000400
+_ATTR_CMN_ERROR = 0x20000000
+_ATTR_CMN_RETURNED_ATTRS = 0x80000000
+_ATTR_FILE_DATALENGTH = 0x00000200
+_VREG = 1
+_VDIR = 2
+_BULK_BUF_SIZE = 64 * 1024
+
+
+class _AttrList(ctypes.Structure):
+    _fields_ = [
+        ("bitmapcount", ctypes.c_ushort),
+        ("reserved", ctypes.c_uint16),
+        ("commonattr", ctypes.c_uint32),
+        ("volattr", ctypes.c_uint32),
+        ("dirattr", ctypes.c_uint32),
+        ("fileattr", ctypes.c_uint32),
+        ("forkattr", ctypes.c_uint32),
+    ]
+
+
+def _load_getattrlistbulk():
+    if sys.platform != "darwin":
+        return None
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).getattrlistbulk  # macOS >= 10.10
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [
+        ctypes.c_int,
+        ctypes.POINTER(_AttrList),
+        ctypes.c_void_p,
+        ctypes.c_size_t,
+        ctypes.c_uint64,
+    ]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_getattrlistbulk = _load_getattrlistbulk()
+_BULK_ATTRS = _AttrList(
+    bitmapcount=_ATTR_BIT_MAP_COUNT,
+    commonattr=(
+        _ATTR_CMN_RETURNED_ATTRS
+        | _ATTR_CMN_ERROR
+        | _ATTR_CMN_NAME
+        | _ATTR_CMN_OBJTYPE
+        | _ATTR_CMN_MODTIME
+    ),
+    # Logical size of the data fork, i.e. what os.stat reports as st_size
+    fileattr=_ATTR_FILE_DATALENGTH,
+)
+
+
+def _scan_dir_darwin(folder: str, want_dirs: bool) -> Tuple[List[PdfHit], List[str]]:
+    """macOS counterpart of _scan_dir built on getattrlistbulk(2).
+
+    Falls back to _scan_dir if the call is unavailable or fails mid-listing.
+    """
+    if _getattrlistbulk is None:
+        return _scan_dir(folder, want_dirs)
+    try:
+        fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return [], []
+
+    pdfs: List[PdfHit] = []
+    subdirs: List[str] = []
+    buf = ctypes.create_string_buffer(_BULK_BUF_SIZE)
     try:
-        rel = child.relative_to(root)
-        return str(rel)
-    except Exception:
-        return str(child)
+        while True:
+            count = _getattrlistbulk(fd, ctypes.byref(_BULK_ATTRS), buf, _BULK_BUF_SIZE, 0)
+            if count == 0:
+                break
+            if count < 0:
+                return _scan_dir(folder, want_dirs)
+
+            # Each record: u32 length, attribute_set_t returned, then the
+            # requested attributes in bit order (ERROR first after RETURNED).
+            off = 0
+            for _ in range(count):
+                (length,) = struct.unpack_from("<I", buf, off)
+                common, _vol, _dir, fileattr, _fork = struct.unpack_from("<5I", buf, off + 4)
+                pos = off + 24
+                off += length
+
+                if common & _ATTR_CMN_ERROR:
+                    (err,) = struct.unpack_from("<I", buf, pos)
+                    pos += 4
+                    if err:
+                        continue
+
+                name_off, name_len = struct.unpack_from("<iI", buf, pos)
+                # attrreference_t offset is relative to itself; length includes the NUL
+                name = os.fsdecode(buf[pos + name_off : pos + name_off + name_len - 1])
+                pos += 8
+                (objtype,) = struct.unpack_from("<I", buf, pos)
+                pos += 4
+
+                if objtype == _VDIR:
+                    if want_dirs:
+                        subdirs.append(os.path.join(folder, name))
+                elif objtype == _VREG and _is_pdf(name):
+                    sec, nsec = struct.unpack_from("<qq", buf, pos)
+                    pos += 16
+                    if not fileattr & _ATTR_FILE_DATALENGTH:
+                        continue
+                    (size,) = struct.unpack_from("<q", buf, pos)
+                    pdfs.append((os.path.join(folder, name), size, sec + nsec / 1e9))
+    finally:
+        os.close(fd)
+    return pdfs, subdirs
+
+
+# Per-folder lister used by iter_pdf_files
+if sys.platform == "win32":
+    _scan_folder = _scan_dir_win32
+elif sys.platform == "darwin":
+    _scan_folder = _scan_dir_darwin
+else:
+    _scan_folder = _scan_dir
 
 
-def iter_pdf_files(root: Path, depth: int) -> Iterable[Path]:
-    """Yield PDF file Paths under root, limited by directory depth."""
+def iter_pdf_files(
+    root: Path,
+    depth: int,
+    workers: int = SCAN_WORKERS,
+    skip_dirs: frozenset[str] = frozenset(),
+    skip_hidden: bool = False,
+) -> Iterable[PdfHit]:
+    """Yield (path, size, mtime) for PDF files under root, limited by directory depth.
+
+    With ``workers`` > 1, folders are listed concurrently by a thread pool and
+    the order of results is not deterministic. Size and mtime are gathered
+    while listing, so callers don't need to stat again.
+
+    Subfolders whose name is in ``skip_dirs`` (or starts with "." when
+    ``skip_hidden``) are not descended; root itself is always scanned. Names
+    are compared case-insensitively on Windows and macOS.
+    """
     root = root.resolve()
     if depth < 0:
         depth = 0
 
-    # Walk manually to control depth
-    # current_depth: root is 0
-    stack: List[Tuple[Path, int]] = [(root, 0)]
-
-    while stack:
-        folder, d = stack.pop()
+    fold = _FS_IGNORES_CASE and bool(skip_dirs)
+    if fold:
+        skip_dirs = frozenset(n.casefold() for n in skip_dirs)
+
+    def wanted(sub: str) -> bool:
+        if not (skip_dirs or skip_hidden):
+            return True
+        name = os.path.basename(sub)
+        if skip_hidden and name.startswith("."):
+            return False
+        return (name.casefold() if fold else name) not in skip_dirs
+
+    if workers <= 1:
+        # Walk manually to control depth
+        # current_depth: root is 0
+        stack: List[Tuple[str, int]] = [(str(root), 0)]
+        while stack:
+            folder, d = stack.pop()
+            pdfs, subdirs = _scan_folder(folder, d < depth)
+            for sub in subdirs:
+                if wanted(sub):
+                    stack.append((sub, d + 1))
+            yield from pdfs
+        return
+
+    out: queue.Queue = queue.Queue()
+    lock = threading.Lock()
+    pending = 0
+    # Set once the consumer is gone, so queued folders are not listed for
+    # nothing and no new work is handed to a pool that is shutting down.
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    def release() -> None:
+        nonlocal pending
+        with lock:
+            pending -= 1
+            drained = pending == 0
+        if drained:
+            out.put(None)
+
+    def submit(folder: str, d: int) -> None:
+        nonlocal pending
+        with lock:
+            pending += 1
         try:
-            with os.scandir(folder) as it:
-                for entry in it:
-                    # Skip hidden folders/files by default? We keep them, but you can uncomment below.
-                    # if entry.name.startswith('.'):
-                    #     continue
-
-                    try:
-                        if entry.is_file(follow_symlinks=False):
-                            if entry.name.lower().endswith(".pdf"):
-                                yield Path(entry.path)
-                        elif entry.is_dir(follow_symlinks=False):
-                            if d < depth:
-                                stack.append((Path(entry.path), d + 1))
-                    except PermissionError:
-                        # Skip unreadable entries
-                        continue
-        except PermissionError:
-            continue
+            pool.submit(visit, folder, d)
+        except RuntimeError:
+            # Pool already shut down, e.g. the interpreter is exiting
+            stop.set()
+            release()
+
+    def visit(folder: str, d: int) -> None:
+        # current_depth: root is 0
+        try:
+            if stop.is_set():
+                return
+            pdfs, subdirs = _scan_folder(folder, d < depth)
+            for sub in subdirs:
+                if stop.is_set():
+                    break
+                if wanted(sub):
+                    submit(sub, d + 1)
+            if pdfs:
+                out.put(pdfs)
+        except BaseException as e:
+            out.put(e)
+        finally:
+            # Children are counted before the parent is released, so pending
+            # only reaches zero once the whole tree has been listed.
+            release()
 
+    submit(str(root), 0)
+    try:
+        while True:
+            item = out.get()
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield from item
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_scan_results(
+    root: Path,
+    depth: int,
+    skip_dirs: frozenset[str] = frozenset(),
+    skip_hidden: bool = False,
+) -> Iterator[ScanResult]:
+    """Yield a ScanResult per PDF as soon as it is found.
 
-def scan_pdfs(root: Path, depth: int) -> List[ScanResult]:
-    results: List[ScanResult] = []
-    idx = 0
-    for p in iter_pdf_files(root, depth):
-        try:
-            st = p.stat()
-            size_b = int(st.st_size)
-            mtime = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(st.st_mtime))
-        except Exception:
-            # If stat fails, skip
-            continue
+    Results come in discovery order and are numbered in that order; use
+    scan_pdfs() for the sorted list. See iter_pdf_files for the skip options.
+    """
+    # Paths from iter_pdf_files are plain strings under the resolved root;
+    # stick to os.path here rather than building Path objects per file.
+    root_str = str(root.resolve())
+    pdf_files = iter_pdf_files(root, depth, skip_dirs=skip_dirs, skip_hidden=skip_hidden)
+
+    # Per-file loop: bind globals/attributes locally, and work out each
+    # folder's relative path once since PDFs cluster in few folders.
+    split = os.path.split
+    human_mb = _human_mb
+    result = ScanResult
+    rel_dirs: dict = {}
+    for idx, (path, size_b, mtime) in enumerate(pdf_files, start=1):
+        parent, name = split(path)
+        rel = rel_dirs.get(parent)
+        if rel is None:
+            rel = _safe_relpath(parent, root_str)
+            if rel == ".":
+                rel = ""
+            rel_dirs[parent] = rel
+        # Positional: index, rel_dir, filename, size_bytes, size_mb, full_path, mtime
+        yield result(idx, rel, name, size_b, human_mb(size_b), path, mtime)
+
+
+def scan_pdfs(
+    root: Path,
+    depth: int,
+    skip_dirs: frozenset[str] = frozenset(),
+    skip_hidden: bool = False,
+) -> List[ScanResult]:
+    return sort_results(list(iter_scan_results(root, depth, skip_dirs, skip_hidden)))
 
-        idx += 1
-        rel = _safe_relpath(p.parent, root)
-        results.append(
-            ScanResult(
-                index=idx,
-                rel_dir=rel if rel != "." else "",
-                filename=p.name,
-                size_bytes=size_b,
-                size_mb=_human_mb(size_b),
-                full_path=str(p),
-                mtime=mtime,
-            )
-        )
 
-    # Sort: bigger first, then name
-    results.sort(key=lambda r: (-r.size_bytes, r.filename.lower()))
+def sort_results(results: List[ScanResult]) -> List[ScanResult]:
+    """Sort in place (largest first, then name), renumber and return results."""
+    # Sort: bigger first, then name. list.sort evaluates the key once per
+    # element (decorate-sort-undecorate), so lower() runs N times, not N log N.
+    # The scan yields files in no fixed order, so the full path breaks the
+    # remaining ties; otherwise rows would move between scans of one folder.
+    results.sort(key=lambda r: (-r.size_bytes, r.filename.lower(), r.full_path))
 
     # Re-number after sorting
     for i, r in enumerate(results, start=1):
@@ -128,98 +545,322 @@ def scan_pdfs(root: Path, depth: int) -> List[ScanResult]:
     return results
 
 
+DETAIL_HEADER = [
+    "序号",
+    "相对目录",
+    "文件名",
+    "大小(Bytes)",
+    "大小(MB)",
+    "修改时间",
+    "完整路径",
+]
+DETAIL_COL_WIDTHS = {
+    1: 7,
+    2: 26,
+    3: 42,
+    4: 14,
+    5: 12,
+    6: 20,
+    7: 70,
+}
+SUMMARY_TOP_HEADER = ["序号", "文件名", "大小(MB)", "相对目录"]
+SUMMARY_COL_WIDTHS = {1: 18, 2: 50, 3: 14, 4: 30}
+
+# openpyxl style objects are immutable; build them once and share them
+_FONT_BOLD = Font(bold=True)
+_ALIGN_HEADER = Alignment(horizontal="center", vertical="center")
+_ALIGN_CENTER = Alignment(horizontal="center")
+_ALIGN_RIGHT = Alignment(horizontal="right")
+
+
 def export_to_excel(
     out_path: Path,
     root: Path,
     depth: int,
-    results: List[ScanResult],
+    results: Iterable[ScanResult],
+) -> None:
+    """Write the report. results may be a list or a one-shot stream."""
+    if xlsxwriter is not None:
+        _export_xlsxwriter(out_path, root, depth, results)
+    elif pyexcelerate is not None:
+        _export_pyexcelerate(out_path, root, depth, results)
+    else:
+        _export_openpyxl(out_path, root, depth, results)
+
+
+def _summary_head(root: Path, depth: int, count: int, total_bytes: int) -> List[list]:
+    """Summary sheet rows above the Top 20 table header (which is row 8)."""
+    return [
+        ["扫描根目录", str(root)],
+        ["扫描目录级数(depth)", depth],
+        ["PDF数量", count],
+        ["总大小(Bytes)", total_bytes],
+        ["总大小(MB)", round(total_bytes / (1024 * 1024), 3)],
+        [],
+        ["Top 20 最大PDF"],
+    ]
+
+
+def _export_xlsxwriter(
+    out_path: Path,
+    root: Path,
+    depth: int,
+    results: Iterable[ScanResult],
+) -> None:
+    # xlsxwriter writes the file in close(). Build it beside out_path and
+    # move it into place only when complete, so a failed export leaves no
+    # truncated report (and any previous file untouched), as openpyxl does.
+    fd, tmp_path = tempfile.mkstemp(prefix=out_path.stem, suffix=".tmp", dir=out_path.parent)
+    os.close(fd)
+
+    # constant_memory flushes each row as soon as the next one starts.
+    # File names are data: never turn them into formulas or hyperlinks.
+    wb = xlsxwriter.Workbook(
+        tmp_path,
+        {"constant_memory": True, "strings_to_formulas": False, "strings_to_urls": False},
+    )
+    try:
+        header_fmt = wb.add_format({"bold": True, "align": "center", "valign": "vcenter"})
+        center_fmt = wb.add_format({"align": "center"})
+        right_fmt = wb.add_format({"align": "right"})
+
+        # Sheet 1: details
+        ws = wb.add_worksheet("PDF大小明细")
+        ws.freeze_panes(1, 0)
+        ws.autofilter(0, 0, 0, len(DETAIL_HEADER) - 1)
+
+        # Width and alignment per column; unformatted cells pick up the
+        # column format, so rows are written without per-cell formats.
+        col_fmt = {1: center_fmt, 4: right_fmt, 5: right_fmt}
+        for col, w in DETAIL_COL_WIDTHS.items():
+            ws.set_column(col - 1, col - 1, w, col_fmt.get(col))
+
+        ws.write_row(0, 0, DETAIL_HEADER, header_fmt)
+
+        count = 0
+        total_bytes = 0
+        write_row = ws.write_row
+
+        def write_details() -> Iterator[ScanResult]:
+            nonlocal count, total_bytes
+            for r in results:
+                count += 1
+                write_row(
+                    count,
+                    0,
+                    (r.index, r.rel_dir, r.filename, r.size_bytes, r.size_mb, r.mtime_str, r.full_path),
+                )
+                total_bytes += r.size_bytes
+                yield r
+
+        topn = heapq.nlargest(20, write_details(), key=lambda r: r.size_bytes)
+
+        # Sheet 2: summary
+        ws2 = wb.add_worksheet("汇总")
+        for col, w in SUMMARY_COL_WIDTHS.items():
+            ws2.set_column(col - 1, col - 1, w)
+
+        row_idx = 0
+        for row in _summary_head(root, depth, count, total_bytes):
+            ws2.write_row(row_idx, 0, row)
+            row_idx += 1
+        ws2.write_row(row_idx, 0, SUMMARY_TOP_HEADER, header_fmt)
+        for i, r in enumerate(topn, start=1):
+            ws2.write_row(row_idx + i, 0, (i, r.filename, r.size_mb, r.rel_dir))
+    except BaseException:
+        # Still close: that deletes xlsxwriter's per-sheet temp files. An
+        # error from close() must not hide the one that got us here.
+        try:
+            wb.close()
+        except Exception:
+            pass
+        _remove_quietly(tmp_path)
+        raise
+
+    try:
+        wb.close()
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _export_pyexcelerate(
+    out_path: Path,
+    root: Path,
+    depth: int,
+    results: Iterable[ScanResult],
 ) -> None:
-    wb = Workbook()
+    wb = pyexcelerate.Workbook()
+    header_style = pyexcelerate.Style(
+        font=pyexcelerate.Font(bold=True),
+        alignment=pyexcelerate.Alignment(horizontal="center", vertical="center"),
+    )
 
     # Sheet 1: details
-    ws = wb.active
-    ws.title = "PDF大小明细"
-
-    header = [
-        "序号",
-        "相对目录",
-        "文件名",
-        "大小(Bytes)",
-        "大小(MB)",
-        "修改时间",
-        "完整路径",
-    ]
-    ws.append(header)
-
-    for hcell in ws[1]:
-        hcell.font = Font(bold=True)
-        hcell.alignment = Alignment(horizontal="center", vertical="center")
-
-    for r in results:
-        ws.append(
-            [
-                r.index,
-                r.rel_dir,
-                r.filename,
-                r.size_bytes,
-                r.size_mb,
-                r.mtime,
-                r.full_path,
-            ]
+    data = [DETAIL_HEADER]
+    add_row = data.append
+    total_bytes = 0
+
+    def collect_details() -> Iterator[ScanResult]:
+        nonlocal total_bytes
+        for r in results:
+            add_row(
+                [r.index, r.rel_dir, r.filename, r.size_bytes, r.size_mb, r.mtime_str, r.full_path]
+            )
+            total_bytes += r.size_bytes
+            yield r
+
+    # One traversal builds the rows, the total and the Top 20 (on input
+    # that is already sorted, nlargest costs one comparison per row).
+    topn = heapq.nlargest(20, collect_details(), key=lambda r: r.size_bytes)
+
+    ws = wb.new_sheet("PDF大小明细", data=data)
+    ws.panes = pyexcelerate.Panes(0, 1)
+    ws.auto_filter = True
+
+    # Styles are applied per row/column rather than per cell.
+    # pyexcelerate writes any string starting with "=" as a formula, so the
+    # name/path columns are forced to plain text.
+    ws.set_row_style(1, header_style)
+    text = XlsxDataTypes.INLINE_STRING
+    align_right = pyexcelerate.Alignment(horizontal="right")
+    col_align = {1: pyexcelerate.Alignment(horizontal="center"), 4: align_right, 5: align_right}
+    col_type = {2: text, 3: text, 7: text}
+    for col, w in DETAIL_COL_WIDTHS.items():
+        ws.set_col_style(
+            col,
+            pyexcelerate.Style(size=w, alignment=col_align.get(col), data_type=col_type.get(col)),
         )
 
-    # Formatting
+    # Sheet 2: summary
+    summary = _summary_head(root, depth, len(data) - 1, total_bytes)
+    summary.append(SUMMARY_TOP_HEADER)
+    summary.extend(
+        [i, r.filename, r.size_mb, r.rel_dir] for i, r in enumerate(topn, start=1)
+    )
+    ws2 = wb.new_sheet("汇总", data=summary)
+    ws2.set_row_style(8, header_style)
+    for col, w in SUMMARY_COL_WIDTHS.items():
+        ws2.set_col_style(col, pyexcelerate.Style(size=w))
+    # Column B also holds numbers here, so mark the path/name cells one by one
+    text_style = pyexcelerate.Style(data_type=text)
+    ws2.set_cell_style(1, 2, text_style)
+    for row in range(9, 9 + len(topn)):
+        ws2.set_cell_style(row, 2, text_style)
+        ws2.set_cell_style(row, 4, text_style)
+
+    wb.save(str(out_path))
+
+
+def _export_openpyxl(
+    out_path: Path,
+    root: Path,
+    depth: int,
+    results: Iterable[ScanResult],
+) -> None:
+    # Write-only mode streams rows straight to disk instead of keeping a Cell
+    # object per value; styles must therefore be attached while appending.
+    wb = Workbook(write_only=True)
+
+    # Register the formats once as named styles; cells then just refer to them
+    wb.add_named_style(NamedStyle("pdf_header", font=_FONT_BOLD, alignment=_ALIGN_HEADER))
+    wb.add_named_style(NamedStyle("pdf_center", alignment=_ALIGN_CENTER))
+    wb.add_named_style(NamedStyle("pdf_right", alignment=_ALIGN_RIGHT))
+
+    def styled(ws, style: str, value=None) -> WriteOnlyCell:
+        c = WriteOnlyCell(ws, value=value)
+        c.style = style
+        return c
+
+    def header_row(ws, values: List[str]) -> list:
+        return [styled(ws, "pdf_header", v) for v in values]
+
+    def text(ws, value: str):
+        # openpyxl turns any string starting with "=" into a formula;
+        # names and paths must stay plain text like the other writers.
+        if value[:1] != "=":
+            return value
+        c = WriteOnlyCell(ws, value=value)
+        c.data_type = "s"
+        return c
+
+    # Sheet 1: details
+    ws = wb.create_sheet("PDF大小明细")
+
+    # Formatting (must be set before the first row is written)
     ws.freeze_panes = "A2"
-    ws.auto_filter.ref = f"A1:{get_column_letter(len(header))}1"
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(DETAIL_HEADER))}1"
 
     # Column widths
-    col_widths = {
-        1: 7,
-        2: 26,
-        3: 42,
-        4: 14,
-        5: 12,
-        6: 20,
-        7: 70,
-    }
-    for col, w in col_widths.items():
+    for col, w in DETAIL_COL_WIDTHS.items():
         ws.column_dimensions[get_column_letter(col)].width = w
 
-    # Align numeric columns
-    for row in ws.iter_rows(min_row=2, min_col=1, max_col=7):
-        row[0].alignment = Alignment(horizontal="center")
-        row[3].alignment = Alignment(horizontal="right")
-        row[4].alignment = Alignment(horizontal="right")
+    ws.append(header_row(ws, DETAIL_HEADER))
+
+    count = 0
+    total_bytes = 0
+
+    # A write-only sheet serialises the row inside append(), so one styled
+    # cell per formatted column can be refilled for every row.
+    idx_cell = styled(ws, "pdf_center")
+    bytes_cell = styled(ws, "pdf_right")
+    mb_cell = styled(ws, "pdf_right")
+
+    def write_details() -> Iterator[ScanResult]:
+        nonlocal count, total_bytes
+        for r in results:
+            idx_cell.value = r.index
+            bytes_cell.value = r.size_bytes
+            mb_cell.value = r.size_mb
+            ws.append(
+                [
+                    idx_cell,
+                    text(ws, r.rel_dir),
+                    text(ws, r.filename),
+                    bytes_cell,
+                    mb_cell,
+                    r.mtime_str,
+                    text(ws, r.full_path),
+                ]
+            )
+            count += 1
+            total_bytes += r.size_bytes
+            yield r
+
+    # Single pass: rows go to disk as they arrive while the summary's
+    # Top 20 is picked from the same stream.
+    topn = heapq.nlargest(20, write_details(), key=lambda r: r.size_bytes)
 
     # Sheet 2: summary
     ws2 = wb.create_sheet("汇总")
-    ws2.append(["扫描根目录", str(root)])
-    ws2.append(["扫描目录级数(depth)", depth])
-    ws2.append(["PDF数量", len(results)])
-    total_bytes = sum(r.size_bytes for r in results)
-    ws2.append(["总大小(Bytes)", total_bytes])
-    ws2.append(["总大小(MB)", round(total_bytes / (1024 * 1024), 3)])
-
-    ws2.append([])
-    ws2.append(["Top 20 最大PDF"]) 
-    ws2.append(["序号", "文件名", "大小(MB)", "相对目录"]) 
-
-    topn = results[:20]
-    for i, r in enumerate(topn, start=1):
-        ws2.append([i, r.filename, r.size_mb, r.rel_dir])
+    for col, w in SUMMARY_COL_WIDTHS.items():
+        ws2.column_dimensions[get_column_letter(col)].width = w
 
-    for hcell in ws2[8]:
-        hcell.font = Font(bold=True)
-        hcell.alignment = Alignment(horizontal="center", vertical="center")
+    head = _summary_head(root, depth, count, total_bytes)
+    head[0][1] = text(ws2, head[0][1])
+    for row in head:
+        ws2.append(row)
+    ws2.append(header_row(ws2, SUMMARY_TOP_HEADER))
 
-    ws2.column_dimensions["A"].width = 18
-    ws2.column_dimensions["B"].width = 50
-    ws2.column_dimensions["C"].width = 14
-    ws2.column_dimensions["D"].width = 30
+    for i, r in enumerate(topn, start=1):
+        ws2.append([i, text(ws2, r.filename), r.size_mb, text(ws2, r.rel_dir)])
 
     wb.save(out_path)
 
 
+# GUI scan: rows per queue message / per table refresh, and poll interval
+SCAN_BATCH = 500
+SCAN_POLL_MS = 50
+
+
 class App(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -230,9 +871,16 @@ class App(tk.Tk):
         self.root_dir = tk.StringVar(value="")
         self.depth = tk.IntVar(value=2)
         self.include_zero = tk.BooleanVar(value=True)
+        self.skip_system_dirs = tk.BooleanVar(value=False)
 
         self._results: List[ScanResult] = []
 
+        # Background scan state (see run_scan)
+        self._scan_thread: threading.Thread | None = None
+        self._scan_queue: queue.Queue = queue.Queue()
+        self._found: List[ScanResult] = []
+        self._pending: deque = deque()
+
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -256,8 +904,14 @@ class App(tk.Tk):
             foreground="#555",
         ).grid(row=1, column=1, sticky="w", padx=(110, 0), pady=(10, 0))
 
+        ttk.Checkbutton(
+            frm,
+            text="跳过隐藏目录和系统目录（.git、node_modules、$RECYCLE.BIN 等）",
+            variable=self.skip_system_dirs,
+        ).grid(row=2, column=1, sticky="w", padx=(8, 0), pady=(10, 0))
+
         btns = ttk.Frame(frm)
-        btns.grid(row=0, column=3, rowspan=2, sticky="e", padx=(12, 0))
+        btns.grid(row=0, column=3, rowspan=3, sticky="e", padx=(12, 0))
         ttk.Button(btns, text="开始扫描", command=self.run_scan).pack(fill="x")
         ttk.Button(btns, text="导出Excel", command=self.export_excel).pack(fill="x", pady=(8, 0))
 
@@ -312,19 +966,29 @@ class App(tk.Tk):
             self.root_dir.set(d)
 
     def _clear_table(self) -> None:
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+
+    @staticmethod
+    def _row_values(r: ScanResult) -> tuple:
+        return (r.index, r.rel_dir, r.filename, "%.3f" % r.size_mb, r.size_bytes, r.mtime_str)
 
     def _fill_table(self, results: List[ScanResult]) -> None:
         self._clear_table()
+        tree = self.tree
+        insert = tree.insert
+        row_values = self._row_values
+        # Runs once per row on large result sets: keep lookups out of the
+        # loop. Tk redraws once, after the loop, when it is next idle.
         for r in results:
-            self.tree.insert(
-                "",
-                "end",
-                values=(r.index, r.rel_dir, r.filename, f"{r.size_mb:.3f}", r.size_bytes, r.mtime),
-            )
+            insert("", "end", values=row_values(r))
 
     def run_scan(self) -> None:
+        if self._scan_thread is not None:
+            # A scan is already running
+            return
+
         root = self.root_dir.get().strip()
         if not root:
             messagebox.showwarning("缺少目录", "请先选择要扫描的目录。")
@@ -339,18 +1003,84 @@ class App(tk.Tk):
 
         self.status.set("正在扫描PDF…")
         self.progress.start(10)
-        self.update_idletasks()
+        self._results = []
+        self._found = []
+        self._pending.clear()
+        self._clear_table()
 
+        # Scan off the Tk thread so the window (and the progressbar) keep
+        # running; results come back through a queue polled with after().
+        self._scan_queue = queue.Queue()
+        self._scan_thread = threading.Thread(
+            target=self._scan_worker,
+            args=(root_path, depth, bool(self.skip_system_dirs.get()), self._scan_queue),
+            daemon=True,
+        )
+        self._scan_thread.start()
+        self.after(SCAN_POLL_MS, self._drain_queue)
+
+    @staticmethod
+    def _scan_worker(root_path: Path, depth: int, skip_system: bool, out: queue.Queue) -> None:
+        # Runs on the worker thread: must not touch any Tk widget.
+        batch: List[ScanResult] = []
+        skip_dirs = DEFAULT_SKIP_DIRS if skip_system else frozenset()
         try:
-            results = scan_pdfs(root_path, depth)
+            for r in iter_scan_results(root_path, depth, skip_dirs, skip_hidden=skip_system):
+                batch.append(r)
+                if len(batch) >= SCAN_BATCH:
+                    out.put(("batch", batch))
+                    batch = []
+            if batch:
+                out.put(("batch", batch))
+            out.put(("done", None))
         except Exception as e:
+            out.put(("error", e))
+
+    def _drain_queue(self) -> None:
+        finished = False
+        error: Exception | None = None
+        try:
+            while True:
+                kind, payload = self._scan_queue.get_nowait()
+                if kind == "batch":
+                    self._found.extend(payload)
+                    self._pending.extend(payload)
+                elif kind == "done":
+                    finished = True
+                else:
+                    error = payload
+                    finished = True
+        except queue.Empty:
+            pass
+
+        if error is not None:
+            self._scan_thread = None
+            # Don't leave a partial, unsorted table behind
+            self._pending.clear()
+            self._found = []
+            self._clear_table()
             self.progress.stop()
             self.status.set("扫描失败")
-            messagebox.showerror("扫描失败", f"扫描过程中发生错误：\n{e}")
+            messagebox.showerror("扫描失败", f"扫描过程中发生错误：\n{error}")
             return
-        finally:
-            self.progress.stop()
 
+        if finished:
+            self._finish_scan()
+            return
+
+        # Show what has been found so far, a bounded number of rows per tick
+        for _ in range(min(SCAN_BATCH, len(self._pending))):
+            self.tree.insert("", "end", values=self._row_values(self._pending.popleft()))
+        self.status.set(f"正在扫描PDF…已找到 {len(self._found)} 个")
+        self.after(SCAN_POLL_MS, self._drain_queue)
+
+    def _finish_scan(self) -> None:
+        self._scan_thread = None
+        self._pending.clear()
+        self.progress.stop()
+
+        results = sort_results(self._found)
+        self._found = []
         self._results = results
         self._fill_table(results)
 